@@ -88,10 +88,11 @@ class NRealSpace(Space):
 
         mean = mean.to(device)
 
+        # sample on the target device directly (no host-to-device copy)
         return (
-            torch.distributions.Laplace(torch.zeros(self.n), lbd)
-            .rsample(sample_shape=(size,))
-            .to(device)
+            torch.distributions.Laplace(
+                torch.zeros(self.n, device=device), lbd
+            ).rsample(sample_shape=(size,))
             + mean
         )
 
@@ -111,12 +112,11 @@ class NRealSpace(Space):
         assert len(mean.shape) == 2
         assert isinstance(lbd, float)
 
-        result = sut.sample_generalized_normal(mean, lbd, p, (size, self.n))
-
+        # the samples are generated on the device of the mean
         if device is not None:
-            result = result.to(device)
+            mean = mean.to(device)
 
-        return result
+        return sut.sample_generalized_normal(mean, lbd, p, (size, self.n))
 
 
 class NSphereSpace(Space):
@@ -317,9 +317,11 @@ class NBoxSpace(Space):
         if len(mean.shape) == 1:
             mean = mean.unsqueeze(0)
 
-        sampler = lambda s: torch.distributions.Laplace(
-            torch.zeros(self.n), lbd
-        ).rsample(sample_shape=(s,)).to(device) + mean.to(device)
+        # sample on the target device directly (no host-to-device copy per call)
+        mean = mean.to(device)
+        laplace = torch.distributions.Laplace(torch.zeros(self.n, device=device), lbd)
+
+        sampler = lambda s: laplace.rsample(sample_shape=(s,)) + mean
         values = sut.truncated_rejection_resampling(
             sampler, self.min_, self.max_, size, self.n, device=device
         )
@@ -343,6 +345,10 @@ class NBoxSpace(Space):
         if len(mean.shape) == 1:
             mean = mean.unsqueeze(0)
 
+        # the samples are generated on the device of the mean
+        if device is not None:
+            mean = mean.to(device)
+
         sampler = lambda s: sut.sample_generalized_normal(mean, lbd, p, (s, self.n))
         values = sut.truncated_rejection_resampling(
             sampler, self.min_, self.max_, size, self.n, device=device
@@ -94,13 +94,21 @@ def sample_generalized_normal(mean: torch.Tensor, lbd: float, p: int, shape):
     assert isinstance(lbd, float)
 
     ipower = 1.0 / p
-    gamma_dist = torch.distributions.Gamma(ipower, 1.0)
+    # sample on the device of the mean (no host-to-device copy)
+    gamma_dist = torch.distributions.Gamma(
+        torch.tensor(ipower, device=mean.device),
+        torch.tensor(1.0, device=mean.device),
+    )
     gamma_sample = gamma_dist.rsample(shape)
     # could speed up operations, but doesnt....
     # gamma_sample = torch._standard_gamma(torch.ones(shape) * ipower)
-    binary_sample = torch.randint(low=0, high=2, size=shape, dtype=mean.dtype) * 2 - 1
+    binary_sample = (
+        torch.randint(low=0, high=2, size=shape, dtype=mean.dtype, device=mean.device)
+        * 2
+        - 1
+    )
     sampled = binary_sample * torch.pow(torch.abs(gamma_sample), ipower)
-    return mean + lbd * sampled.to(mean.device)
+    return mean + lbd * sampled
 
 
 def truncated_rejection_resampling(
@@ -124,19 +132,21 @@ def truncated_rejection_resampling(
         device: Torch device.
     """
 
-    result = torch.ones((size, n), device=device) * np.nan
-    finished_mask = ~torch.isnan(result)
-    while torch.sum(finished_mask).item() < n * size:
+    result = torch.full((size, n), np.nan, device=device)
+    finished_mask = torch.zeros((size, n), dtype=torch.bool, device=device)
+    while not torch.all(finished_mask).item():
         # get samples from sampler_fn w/o truncation
         buffer = sampler_fn(size * buffer_size_factor)
-        buffer = buffer.view(buffer_size_factor, size, n)
+        # torch.where does not promote, so cast like the former masked assignment
+        buffer = buffer.view(buffer_size_factor, size, n).to(result.dtype)
         # check which samples are within the feasible set
         buffer_mask = (buffer >= min_) & (buffer <= max_)
         # calculate how many samples to use
 
         for i in range(buffer_size_factor):
             copy_mask = buffer_mask[i] & (~finished_mask)
-            result[copy_mask] = buffer[i][copy_mask]
-            finished_mask[copy_mask] = True
+            # torch.where avoids the device sync of boolean mask indexing
+            result = torch.where(copy_mask, buffer[i], result)
+            finished_mask |= copy_mask
 
     return result
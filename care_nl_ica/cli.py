@@ -46,9 +46,6 @@ class MyLightningCLI(LightningCLI):
             else:
                 self.trainer.logger.__dict__["_wandb_init"]["mode"] = "online"
 
-            # todo: maybe set run in the CLI to false and call watch before?
-            self.trainer.logger.watch(self.model, log="all", log_freq=250)
-
 
 if __name__ == "__main__":
     install_package()
@@ -138,7 +138,6 @@ class ContrastiveDataModule(pl.LightningDataModule):
             p.requires_grad = False
 
         self.mixing = self.mixing.to(self.hparams.device)
-        torch.cuda.empty_cache()
 
     def _calc_dep_mat(self) -> None:
         if self.hparams.use_dep_mat is True:
@@ -152,11 +151,31 @@ class ContrastiveDataModule(pl.LightningDataModule):
             if self.hparams.permute is True and self.hparams.use_sem is True:
                 # print(f"{dep_mat=}")
                 # set_trace()
-                self.mixing_jacobian = self.mixing_jacobian[
-                    torch.argsort(self.mixing.permute_indices), :
-                ]
+                self.mixing_jacobian = self.mixing_jacobian.index_select(
+                    0, self.mixing.inv_permute_indices
+                )
 
-            self.unmixing_jacobian = torch.tril(self.mixing_jacobian.inverse())
+            if torch.equal(self.mixing_jacobian, self.mixing_jacobian.tril()) is True:
+                # the inverse of a lower triangular matrix is lower triangular,
+                # so a triangular solve suffices (cheaper and more stable)
+                # unlike inverse(), the solve does not raise for singular matrices
+                if torch.any(self.mixing_jacobian.diagonal() == 0).item() is True:
+                    raise ValueError(
+                        f"The mixing Jacobian is singular, {self.mixing_jacobian=}"
+                    )
+                self.unmixing_jacobian = torch.linalg.solve_triangular(
+                    self.mixing_jacobian,
+                    torch.eye(
+                        self.mixing_jacobian.shape[0],
+                        device=self.mixing_jacobian.device,
+                        dtype=self.mixing_jacobian.dtype,
+                    ),
+                    upper=False,
+                )
+            else:
+                self.unmixing_jacobian = torch.tril(self.mixing_jacobian.inverse())
+            # the GT edges are constant, so binarize them once (for the metrics)
+            self.unmixing_jacobian_mask = self.unmixing_jacobian.bool()
 
             self.mixing_cond = torch.linalg.cond(self.mixing_jacobian)
             self.unmixing_cond = torch.linalg.cond(self.unmixing_jacobian)
@@ -165,17 +184,22 @@ class ContrastiveDataModule(pl.LightningDataModule):
 
             self.indirect_causes, self.paths = indirect_causes(self.unmixing_jacobian)
 
-            torch.cuda.empty_cache()
-
     def setup(self, stage: Optional[str] = None):
         self._setup_mixing()
 
         # generate data
         self.dataset = ContrastiveDataset(self.hparams, self.mixing)
-        self.dl = DataLoader(self.dataset, batch_size=self.hparams.batch_size)
+        # the dataset yields whole batches, so skip the per-item collation
+        self.dl = DataLoader(self.dataset, batch_size=None)
 
         self._calc_dep_mat()
 
+        if self.trainer is not None and self.trainer.world_size > 1:
+            # the mixing is the same on all ranks (same seed), but each rank
+            # should sample different batches (batch_size is per rank)
+            # the +1 ensures that no rank replays the stream used for the setup
+            torch.manual_seed(torch.initial_seed() + 1 + self.trainer.global_rank)
+
     def train_dataloader(self):
         return self.dl
 
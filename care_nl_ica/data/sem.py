@@ -68,17 +68,17 @@ class LinearSEM(nn.Module):
 
         print(f"{inv_weight=}")
 
-        self.weight = inv_weight.inverse().tril()
+        self.register_buffer("weight", inv_weight.inverse().tril())
         print(f"{self.weight=}")
 
         self._setup_permutation(permute)
 
     def _setup_permutation(self, permute):
         if self.variant == -1:
-            self.permute_indices = torch.randperm(self.num_vars)
+            permute_indices = torch.randperm(self.num_vars)
         else:
             if self.variant < (fac := math.factorial(self.num_vars)):
-                self.permute_indices = torch.tensor(
+                permute_indices = torch.tensor(
                     list(
                         itertools.islice(
                             itertools.permutations(range(self.num_vars)),
@@ -90,14 +90,19 @@ class LinearSEM(nn.Module):
             else:
                 raise ValueError(f"{self.variant=} should be smaller than {fac}")
 
-        self.permutation = (
-            (lambda x: x)
-            if permute is False
-            else (lambda x: x[:, self.permute_indices])
+        self.register_buffer("permute_indices", permute_indices)
+        # the inverse permutation (to undo the permutation, e.g., of the Jacobian)
+        self.register_buffer(
+            "inv_permute_indices", torch.argsort(permute_indices), persistent=False
         )
 
+        self.permute = permute
+
         print(f"{self.permute_indices=}")
 
+    def permutation(self, x):
+        return x if self.permute is False else x.index_select(1, self.permute_indices)
+
     @property
     def permutation_matrix(self) -> torch.Tensor:
         m = torch.zeros_like(self.weight)
@@ -108,18 +113,6 @@ class LinearSEM(nn.Module):
     def forward(self, x):
         return self.permutation((self.weight @ x.T).T)
 
-    def to(self, device):
-        """
-        Move the model to the specified device.
-
-        :param device: The device to move the model to.
-        """
-        super().to(device)
-        self.weight = self.weight.to(device)
-        # self.mask = self.mask.to(device)
-
-        return self
-
 
 class NonLinearSEM(LinearSEM):
     def __init__(
@@ -146,13 +139,11 @@ class NonLinearSEM(LinearSEM):
             weight_rand_func=weight_rand_func,
         )
 
-        self.slopes = torch.rand(num_vars).clip(0.25, 1)
+        self.register_buffer("slopes", torch.rand(num_vars).clip(0.25, 1))
         print(f"{self.slopes=}")
         print("-------fixing slopes to 0.25--------")
-        self.relus = [
-            lambda x: torch.nn.functional.leaky_relu(x, negative_slope=0.25)
-            for s in self.slopes
-        ]
+        # the slope is shared by all variables, so a single activation suffices
+        self.negative_slope = 0.25
 
     def forward(self, x):
         # z = torch.zeros_like(x)
@@ -167,4 +158,8 @@ class NonLinearSEM(LinearSEM):
         # else:
         #     z[:, i] = w[i, i] * self.relus[i](x[:, i])
 
-        return self.permutation(self.relus[0]((self.weight @ x.T).T))
+        return self.permutation(
+            torch.nn.functional.leaky_relu(
+                (self.weight @ x.T).T, negative_slope=self.negative_slope
+            )
+        )
@@ -22,7 +22,6 @@ class ContrastiveDataset(torch.utils.data.IterableDataset):
             sample_marginal=setup_marginal(self.hparams),
             sample_conditional=setup_conditional(self.hparams),
         )
-        torch.cuda.empty_cache()
 
     def _setup_space(self):
         if self.hparams.space_type == "box":
@@ -45,6 +44,8 @@ class ContrastiveDataset(torch.utils.data.IterableDataset):
             )
         )
 
-        mixtures = torch.stack(tuple(map(self.transform, sources)))
+        # mix all samples in a single call (the mixing acts row-wise)
+        mixtures = self.transform(sources.view(-1, sources.shape[-1])).view_as(sources)
 
-        return iter((sources, mixtures))
+        # a single, already batched item (use batch_size=None in the DataLoader)
+        return iter(((sources, mixtures),))
@@ -19,7 +19,7 @@ def calc_jacobian(
     :param norm_range:
     :param norm_diagonal:
     :param reverse_ad: use reverse mode auto-differentiation (e.g., PReLU only supports this)
-    :param vectorize: use functorch vectorization
+    :param vectorize: use functorch (torch.func) vectorization instead of a loop over the outputs
     :param model: the model to calculate the Jacobian of
     :param latents: the inputs for evaluating the model
     :param normalize: flag to rescale the Jacobian to have unit norm
@@ -30,26 +30,34 @@ def calc_jacobian(
     in_training: bool = model.training
     model.eval()  # otherwise we will get 0 gradients
     with torch.set_grad_enabled(True):
-        jacob = []
         input_vars = latents.clone().requires_grad_(True)
 
         output_vars = model(input_vars)
         if not vectorize:
-            for i in range(output_vars.shape[1]):
-                jacob.append(
-                    torch.autograd.grad(
-                        output_vars[:, i : i + 1],
-                        input_vars,
-                        create_graph=True,
-                        grad_outputs=torch.ones(output_vars[:, i : i + 1].shape).to(
-                            output_vars.device
-                        ),
-                    )[0].detach()
-                )
+            # preallocate the result instead of stacking a list of rows,
+            # the output gradients are the same for each row
+            jacobian = torch.empty(
+                (*output_vars.shape, input_vars.shape[1]),
+                dtype=input_vars.dtype,
+                device=input_vars.device,
+            )
+            grad_outputs = torch.ones_like(output_vars[:, :1])
 
-            jacobian = torch.stack(jacob, 1)
+            for i in range(output_vars.shape[1]):
+                # the rows are detached, so only the graph needs to be kept
+                # (create_graph would build the double-backward graph)
+                jacobian[:, i, :] = torch.autograd.grad(
+                    output_vars[:, i : i + 1],
+                    input_vars,
+                    retain_graph=True,
+                    grad_outputs=grad_outputs,
+                )[0].detach()
         else:
-            from functorch import vmap, jacrev, jacfwd
+            try:
+                # functorch is part of PyTorch since 2.0
+                from torch.func import vmap, jacrev, jacfwd
+            except ImportError:
+                from functorch import vmap, jacrev, jacfwd
 
             if reverse_ad is True:
                 jac_fn = jacrev
@@ -57,9 +65,14 @@ def calc_jacobian(
                 jac_fn = jacfwd
 
             sample_jacobian = jac_fn(model.forward, argnums=0)
-            jacobian = vmap(
-                lambda x: sample_jacobian(torch.unsqueeze(x, 0)), in_dims=0
-            )(input_vars).squeeze()
+            # detached like the rows of the loop above
+            jacobian = (
+                vmap(lambda x: sample_jacobian(torch.unsqueeze(x, 0)), in_dims=0)(
+                    input_vars
+                )
+                .squeeze()
+                .detach()
+            )
 
     if normalize is True:
         # normalize the Jacobian by making it volume preserving
@@ -138,10 +151,15 @@ def calc_dependency_matrix(encoder: nn.Module, latents: torch.Tensor) -> torch.T
 
 
 def jacobians(unmixing, sources, mixtures, eps=1e-6, calc_numerical: bool = False):
+    # the Jacobians are calculated with vmap over the samples (one batched
+    # reverse-mode pass instead of one backward pass per output dimension)
     # calculate the dependency matrix
     dep_mat = (
         calc_jacobian(
-            unmixing, mixtures.clone(), normalize=unmixing.hparams.normalize_latents
+            unmixing,
+            mixtures.clone(),
+            normalize=unmixing.hparams.normalize_latents,
+            vectorize=True,
         )
         .abs()
         .mean(0)
@@ -149,7 +167,10 @@ def jacobians(unmixing, sources, mixtures, eps=1e-6, calc_numerical: bool = Fals
 
     jac_enc_dec = (
         calc_jacobian(
-            unmixing, sources.clone(), normalize=unmixing.hparams.normalize_latents
+            unmixing,
+            sources.clone(),
+            normalize=unmixing.hparams.normalize_latents,
+            vectorize=True,
         )
         .abs()
         .mean(0)
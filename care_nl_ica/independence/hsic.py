@@ -42,18 +42,38 @@ class HSIC(object):
         :param ls_y: lenght scale of the y RBF kernel
         """
 
-        num_samples = x.shape[0]
-
         # calculate the RBF kernel values
         kernel_x = self.rbf(x, x, ls_x)
         kernel_y = self.rbf(y, y, ls_y)
 
-        H = (
-            torch.eye(num_samples, device=x.device)
-            - torch.ones(num_samples, num_samples, device=x.device) / num_samples
+        return self._statistics_from_kernels(self.center_kernel(kernel_x), kernel_y)
+
+    @staticmethod
+    def center_kernel(kernel: torch.Tensor) -> torch.Tensor:
+        """
+        Calculates H @ kernel @ H for the centering matrix H without the matrix products
+
+        :param kernel: kernel matrix in the form of (num_samples, num_samples)
+        """
+        return (
+            kernel
+            - kernel.mean(dim=0, keepdim=True)
+            - kernel.mean(dim=1, keepdim=True)
+            + kernel.mean()
         )
 
-        return torch.trace(H @ kernel_x @ H @ kernel_y) / num_samples**2
+    @staticmethod
+    def _statistics_from_kernels(
+        centered_kernel_x: torch.Tensor, kernel_y: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Calculates trace(H @ kernel_x @ H @ kernel_y) / n^2. As both kernels are
+        symmetric, the trace equals the sum of the elementwise product.
+
+        :param centered_kernel_x: output of `center_kernel` for the x RBF kernel
+        :param kernel_y: y RBF kernel
+        """
+        return (centered_kernel_x * kernel_y).sum() / kernel_y.shape[0] ** 2
 
     @staticmethod
     def calc_ls(x: torch.Tensor) -> torch.Tensor:
@@ -107,18 +127,25 @@ class HSIC(object):
 
         alpha_corr = self.alpha / bonferroni
 
-        stat_no_perm = self.test_statistics(x, y, ls_x, ls_y)
+        # the kernels do not change with the permutations, so calculate them once
+        # permuting y amounts to permuting the rows and columns of its kernel
+        centered_kernel_x = self.center_kernel(self.rbf(x, x, ls_x))
+        kernel_y = self.rbf(y, y, ls_y)
+
+        stat_no_perm = self._statistics_from_kernels(centered_kernel_x, kernel_y)
 
         num_samples = x.shape[0]
 
         # calculate test statistics for the permutations
-        stats = []
-        for _ in range(self.num_permutations):
-            idx = torch.randperm(num_samples)
+        # (written into a preallocated tensor, so there is no host round trip)
+        stats = torch.empty(self.num_permutations, device=x.device)
+        for i in range(self.num_permutations):
+            idx = torch.randperm(num_samples, device=x.device)
 
-            stats.append(self.test_statistics(x, y[idx], ls_x, ls_y))
+            stats[i] = self._statistics_from_kernels(
+                centered_kernel_x, kernel_y[idx][:, idx]
+            )
 
-        stats = torch.tensor(stats, device=x.device)
         crit_val = torch.quantile(stats, 1 - alpha_corr)
 
         p = (stats > stat_no_perm).sum() / self.num_permutations
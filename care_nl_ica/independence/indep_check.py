@@ -14,26 +14,20 @@ class IndependenceChecker(object):
 
         self.test = HSIC(hparams.num_permutations)
 
-        print("Using Bonferroni = 4")
+        if self.hparams.verbose is True:
+            print("Using Bonferroni = 4")
 
     def check_bivariate_dependence(self, x1, x2):
         decisions = []
         var_map = [1, 1, 2, 2]
-        with torch.no_grad():
-            decisions.append(
-                self.test.run_test(x1[:, 0], x2[:, 1], bonferroni=4).item()
-            )
-            decisions.append(
-                self.test.run_test(x1[:, 0], x2[:, 0], bonferroni=4).item()
-            )
-            decisions.append(
-                self.test.run_test(x1[:, 1], x2[:, 0], bonferroni=4).item()
-            )
-            decisions.append(
-                self.test.run_test(x1[:, 1], x2[:, 1], bonferroni=4).item()
-            )
-
-        return decisions, var_map
+        with torch.inference_mode():
+            decisions.append(self.test.run_test(x1[:, 0], x2[:, 1], bonferroni=4))
+            decisions.append(self.test.run_test(x1[:, 0], x2[:, 0], bonferroni=4))
+            decisions.append(self.test.run_test(x1[:, 1], x2[:, 0], bonferroni=4))
+            decisions.append(self.test.run_test(x1[:, 1], x2[:, 1], bonferroni=4))
+
+        # a single transfer instead of one per decision
+        return torch.stack(decisions).tolist(), var_map
 
     def check_multivariate_dependence(
         self, x1: torch.Tensor, x2: torch.Tensor
@@ -46,15 +40,18 @@ class IndependenceChecker(object):
         """
         num_dim = x1.shape[-1]
         max_edge_num = num_dim**2
-        adjacency_matrix = torch.zeros(num_dim, num_dim).bool()
+        adjacency_matrix = torch.zeros(
+            num_dim, num_dim, dtype=torch.bool, device=x1.device
+        )
 
-        print(max_edge_num)
+        if self.hparams.verbose is True:
+            print(f"{max_edge_num=}")
 
-        with torch.no_grad():
+        with torch.inference_mode():
             for i in range(num_dim):
                 for j in range(num_dim):
                     adjacency_matrix[i, j] = self.test.run_test(
                         x1[:, i], x2[:, j], bonferroni=4  # max_edge_num
-                    ).item()
+                    )
 
-        return adjacency_matrix
+        return adjacency_matrix.cpu()
@@ -91,7 +91,7 @@ class JacobianBinnedPrecisionRecall(Metric):
         """
         Args
             preds: (n_samples,) tensor
-            target: (n_samples, ) tensor
+            target: (n_samples, ) tensor, nonzero elements are edges (or a bool mask)
         """
         preds, target = (
             preds.reshape(
@@ -99,21 +99,23 @@ class JacobianBinnedPrecisionRecall(Metric):
             ).abs(),
             target.reshape(
                 -1,
-            ).abs(),
+            ),
         )
 
         assert preds.shape == target.shape
 
-        if (pred_max := preds.max()) != 1.0:
-            preds /= pred_max
+        # dividing by a max of 1 is a no-op, so there is no need for a
+        # data-dependent branch (which would sync with the device)
+        preds /= preds.max()
 
+        # a no-op for bool targets
         target = target.bool()
-        # Iterate one threshold at a time to conserve memory
-        for i in range(self.num_thresholds):
-            predictions = preds >= self.thresholds[i]
-            self.TPs[i] += (target & predictions).sum(dim=0)
-            self.FPs[i] += ((~target) & (predictions)).sum(dim=0)
-            self.FNs[i] += (target & (~predictions)).sum(dim=0)
+        # the Jacobians are small, so evaluate all thresholds at once,
+        # shape: (num_thresholds, n_samples)
+        predictions = preds.unsqueeze(0) >= self.thresholds.unsqueeze(1)
+        self.TPs += (target & predictions).sum(dim=1)
+        self.FPs += ((~target) & predictions).sum(dim=1)
+        self.FNs += (target & (~predictions)).sum(dim=1)
 
     def compute(self) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         """Returns float tensor of size n_classes."""
@@ -82,9 +82,12 @@ def frobenius_diagonality(matrix: torch.Tensor) -> torch.Tensor:
     :return:
     """
 
-    return 0.5 * (
-        (matrix - torch.eye(matrix.shape[0], device=matrix.device)).norm("fro").pow(2)
-    )
+    # subtract the identity in place on a copy (no eye allocation) and
+    # sum the squares directly instead of squaring the (sqrt-based) norm
+    off_identity = matrix.clone()
+    off_identity.diagonal().sub_(1.0)
+
+    return 0.5 * off_identity.pow(2).sum()
 
 
 def corr_matrix(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
@@ -95,15 +98,16 @@ def corr_matrix(x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
     :return:
     """
 
-    dim = x.shape[0]
-
-    corr_mat = torch.zeros(dim, dim, device=x.device)
+    # center and normalize each row, then all pairwise Pearson coefficients
+    # are given by a single matmul (instead of dim**2 calls to torch.corrcoef)
+    x_centered = x - x.mean(dim=1, keepdim=True)
+    y_centered = y - y.mean(dim=1, keepdim=True)
 
-    for i in range(dim):
-        for j in range(dim):
-            corr_mat[i, j] = torch.corrcoef(torch.stack((x[i, :], y[j, :])))[1, 0]
+    corr_mat = (x_centered / x_centered.norm(dim=1, keepdim=True)) @ (
+        y_centered / y_centered.norm(dim=1, keepdim=True)
+    ).T
 
-    return corr_mat
+    return corr_mat.clamp(-1.0, 1.0)
 
 
 def ksi_correlation(hz: torch.Tensor, z: torch.Tensor) -> torch.Tensor:
@@ -13,8 +13,6 @@ class ContrastiveLearningModel(nn.Module):
         self._setup_unmixing()
         self._setup_loss()
 
-        torch.cuda.empty_cache()
-
     def parameters(self, recurse: bool = True):
         parameters = list(self.unmixing.parameters(recurse))
 
@@ -76,7 +74,8 @@ class ContrastiveLearningModel(nn.Module):
             output_normalization = "fixed_sphere"
             output_normalization_kwargs = dict(init_r=hparams.sphere_r)
         elif hparams.normalization == "":
-            print("Using no output normalization")
+            if hparams.verbose is True:
+                print("Using no output normalization")
             output_normalization = None
         else:
             raise ValueError("Invalid output normalization:", hparams.normalization)
@@ -84,6 +83,8 @@ class ContrastiveLearningModel(nn.Module):
 
     def forward(self, x):
         if isinstance(x, list) or isinstance(x, tuple):
-            return tuple(map(self.unmixing, x))
+            # the unmixing MLP is applied per sample, so a single forward pass
+            # on the concatenated batches replaces one pass per element
+            return self.unmixing(torch.cat(x)).split([len(xi) for xi in x])
         else:
             return self.unmixing(x)
@@ -15,16 +15,13 @@ class SinkhornOperator(object):
         self.num_steps = num_steps
 
     def __call__(self, matrix: torch.Tensor) -> torch.Tensor:
-        def _normalize_row(matrix: torch.Tensor) -> torch.Tensor:
-            return matrix - torch.logsumexp(matrix, 1, keepdim=True)
-
-        def _normalize_column(matrix: torch.Tensor) -> torch.Tensor:
-            return matrix - torch.logsumexp(matrix, 0, keepdim=True)
-
+        # alternating row and column normalization in log-space,
+        # exponentiated only once at the end
         S = matrix
 
         for _ in range(self.num_steps):
-            S = _normalize_column(_normalize_row(S))
+            S = S - torch.logsumexp(S, 1, keepdim=True)
+            S = S - torch.logsumexp(S, 0, keepdim=True)
 
         return torch.exp(S)
 
@@ -50,17 +47,6 @@ class SinkhornNet(nn.Module):
         elif dim_idx == 1:
             return x @ self.doubly_stochastic_matrix
 
-    def to(self, device):
-        """
-        Move the model to the specified device.
-
-        :param device: The device to move the model to.
-        """
-        super().to(device)
-        self.weight = self.weight.to(device)
-
-        return self
-
 
 from scipy.spatial.distance import hamming
 
@@ -149,18 +135,26 @@ def learn_permutation(
         )
     else:
         optim = torch.optim.Adam(s_ica.parameters(), lr=lr)
+
+    # the triangular masks are fixed, so build them once instead of every step
+    tril_mask = torch.tril(torch.ones(dim, dim))
+    triu_mask = 1.0 - tril_mask
+    # est_jac does not change during the optimization
+    abs_est_jac = est_jac.abs()
+
     for i in range(num_steps):
         optim.zero_grad()
+        # each access of doubly_stochastic_matrix runs the Sinkhorn iterations,
+        # so evaluate them once per step
+        ds_ica = s_ica.doubly_stochastic_matrix
         if dag_permute is True:
-            matrix = (
-                s_ica.doubly_stochastic_matrix
-                @ est_jac.abs()
-                @ s_dag.doubly_stochastic_matrix
-            )
+            ds_dag = s_dag.doubly_stochastic_matrix
+            matrix = ds_ica @ abs_est_jac @ ds_dag
         else:
-            matrix = s_ica.doubly_stochastic_matrix @ est_jac.abs()
-        loss_l = -tril_weight * torch.tril(matrix, 0).abs().sum()
-        loss_u = triu_weigth * torch.triu(matrix, 1).abs().sum()
+            matrix = ds_ica @ abs_est_jac
+        abs_matrix = matrix.abs()
+        loss_l = -tril_weight * (abs_matrix * tril_mask).sum()
+        loss_u = triu_weigth * (abs_matrix * triu_mask).sum()
         loss_diag = diag_weight * (1.0 / (matrix.diag() + eps)).sum()
 
         loss = loss_l + loss_u + loss_diag
@@ -169,8 +163,7 @@ def learn_permutation(
 
         if i % 250 == 0 and dag_permute is True:
             correct_order = torch.all(
-                s_dag.doubly_stochastic_matrix.max(1)[1]
-                == torch.tensor(permute_indices)
+                ds_dag.max(1)[1] == torch.tensor(permute_indices)
             ).item()
             if correct_order is True:
                 if verbose is True:
@@ -179,27 +172,31 @@ def learn_permutation(
                     True,
                     j_hamming(true_jac, matrix),
                     j_acc(true_jac, matrix),
-                    permutation_loss(s_dag.doubly_stochastic_matrix).item(),
-                    permutation_loss(s_ica.doubly_stochastic_matrix).item(),
+                    permutation_loss(ds_dag).item(),
+                    permutation_loss(ds_ica).item(),
                 )
 
         optim.step()
 
-    learned_order = s_dag.doubly_stochastic_matrix.max(1)[1]
-    correct_order = torch.tensor(permute_indices)
+    # the final matrices (after the last update)
+    with torch.no_grad():
+        ds_dag = s_dag.doubly_stochastic_matrix
+        ds_ica = s_ica.doubly_stochastic_matrix
 
-    indices = torch.arange(dim)
+    learned_order = ds_dag.max(1)[1]
+    correct_order = torch.tensor(permute_indices)
 
     # calculate the ratio of index pairs that are in the correct order
-    correct_rank_pairs = 0.0
     if len(learned_order.unique()) == dim:
-        for o1 in range(dim):
-            for o2 in range(o1 + 1, dim):
-                correct_rank_pairs += (
-                    indices[learned_order == o1] - indices[learned_order == o2]
-                ).sign() == (
-                    indices[correct_order == o1] - indices[correct_order == o2]
-                ).sign()
+        # position of each variable in the learned and in the true ordering
+        learned_pos = torch.argsort(learned_order)
+        correct_pos = torch.argsort(correct_order)
+
+        # compare the relative order of all (o1, o2) pairs at once, o1 < o2
+        same_rank = (learned_pos.unsqueeze(1) - learned_pos.unsqueeze(0)).sign() == (
+            correct_pos.unsqueeze(1) - correct_pos.unsqueeze(0)
+        ).sign()
+        correct_rank_pairs = torch.triu(same_rank.float(), 1).sum()
     else:
         correct_rank_pairs = -1
 
@@ -208,21 +205,17 @@ def learn_permutation(
         print(f"{true_jac=}")
         print(f"{est_jac=}")
         if dag_permute is True:
-            matrix = (
-                s_ica.doubly_stochastic_matrix
-                @ est_jac
-                @ s_dag.doubly_stochastic_matrix
-            ).detach()
+            matrix = ds_ica @ est_jac @ ds_dag
         else:
-            matrix = (s_ica.doubly_stochastic_matrix @ est_jac).detach()
+            matrix = ds_ica @ est_jac
         print(matrix)
         if dag_permute is True:
-            print(f"S_DAG={s_dag.doubly_stochastic_matrix.detach()}")
-        print(f"S_ICA={s_ica.doubly_stochastic_matrix.detach()}")
+            print(f"S_DAG={ds_dag}")
+        print(f"S_ICA={ds_ica}")
     return (
         False if rank_acc is False else correct_rank_pairs / (dim * (dim - 1) / 2.0),
         j_hamming(true_jac, matrix),
         j_acc(true_jac, matrix),
-        permutation_loss(s_dag.doubly_stochastic_matrix).item(),
-        permutation_loss(s_ica.doubly_stochastic_matrix).item(),
+        permutation_loss(ds_dag).item(),
+        permutation_loss(ds_ica).item(),
     )
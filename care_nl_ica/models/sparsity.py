@@ -14,17 +14,6 @@ class SparseBudgetNet(nn.Module):
             nn.Linear(self.num_dim, self.num_dim).weight, requires_grad=True
         )
 
-    def to(self, device):
-        """
-        Move the model to the specified device.
-
-        :param device: The device to move the model to.
-        """
-        super().to(device)
-        self.weight = self.weight.to(device)
-
-        return self
-
     @property
     def mask(self):
         return torch.sigmoid(self.weight)
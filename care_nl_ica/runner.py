@@ -1,6 +1,7 @@
 import subprocess
 import sys
 from os.path import dirname
+from typing import Optional
 
 import pytorch_lightning as pl
 import torch
@@ -41,12 +42,14 @@ class ContrastiveICAModule(pl.LightningModule):
         log_freq=500,
         offline: bool = False,
         num_permutations=10,
+        allow_tf32: Optional[bool] = None,
     ):
         """
 
+        :param allow_tf32: use TF32 for matmuls and convolutions on Ampere or newer GPUs, None keeps the PyTorch default
         :param num_permutations: number of permutations for HSIC
         :param offline: offline W&B run (sync at the end)
-        :param log_freq: gradient/weight log frequency for W&B, None turns it off
+        :param log_freq: gradient log frequency for W&B, None turns it off
         :param num_thresholds: number of thresholds for calculating the Jacobian precision-recall
         :param log_latent_rec: Log the latents and their reconstructions
         :param normalize_latents: normalize the latents to [0;1] (for the Jacobian calculation)
@@ -67,6 +70,10 @@ class ContrastiveICAModule(pl.LightningModule):
         super().__init__()
         self.save_hyperparameters()
 
+        if self.hparams.allow_tf32 is not None:
+            torch.backends.cuda.matmul.allow_tf32 = self.hparams.allow_tf32
+            torch.backends.cudnn.allow_tf32 = self.hparams.allow_tf32
+
         self.model: ContrastiveLearningModel = ContrastiveLearningModel(
             self.hparams
         ).to(self.hparams.device)
@@ -77,6 +84,9 @@ class ContrastiveICAModule(pl.LightningModule):
         self.indep_checker = IndependenceChecker(self.hparams)
         self.hsic_adj = None
 
+        # whether the logger is a WandbLogger, set in setup (no logger attached yet)
+        self._wandb_logging = False
+
         self._configure_metrics()
 
     def _configure_metrics(self):
@@ -84,13 +94,26 @@ class ContrastiveICAModule(pl.LightningModule):
             num_thresholds=self.hparams.num_thresholds
         )
 
+    def setup(self, stage: Optional[str] = None) -> None:
+        # the logger does not change during a run, so check its type only once
+        # (with DDP, only rank zero has a W&B run)
+        self._wandb_logging = (
+            isinstance(self.logger, pl.loggers.wandb.WandbLogger)
+            and self.global_rank == 0
+        )
+
     def on_train_start(self) -> None:
-        torch.cuda.empty_cache()
-        if isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True:
+        if self._wandb_logging is True:
             self.logger.experiment.log({f"thresholds": self.jac_prec_recall.thresholds})
 
             if self.hparams.log_freq is not None:
-                self.logger.watch(self.model, log="all", log_freq=self.hparams.log_freq)
+                # parameter histograms are expensive to collect, so only track gradients
+                self.logger.watch(
+                    self.model,
+                    log="gradients",
+                    log_freq=self.hparams.log_freq,
+                    log_graph=False,
+                )
 
     def configure_optimizers(self):
         return torch.optim.Adam(self.model.parameters(), lr=self.hparams.lr)
@@ -113,16 +136,16 @@ class ContrastiveICAModule(pl.LightningModule):
 
         """Precision-Recall"""
         self.jac_prec_recall.update(
-            self.dep_mat, self.trainer.datamodule.unmixing_jacobian
+            self.dep_mat, self.trainer.datamodule.unmixing_jacobian_mask
         )
         precisions, recalls, thresholds = self.jac_prec_recall.compute()
-        if isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True:
-            self.logger.experiment.log(
-                {
-                    f"{panel_name}/jacobian/precisions": precisions,
-                    f"{panel_name}/jacobian/recalls": recalls,
-                }
-            )
+
+        # collect everything for W&B and log it with a single call
+        wandb_payload = {
+            f"{panel_name}/jacobian/precisions": precisions,
+            f"{panel_name}/jacobian/recalls": recalls,
+        }
+
         """HSIC"""
         if (
             batch_idx == 0
@@ -135,8 +158,7 @@ class ContrastiveICAModule(pl.LightningModule):
             self.hsic_adj = self.indep_checker.check_multivariate_dependence(
                 reconstructions[0], mixtures[0]
             ).float()
-            if isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True:
-                self.logger.experiment.log({f"{panel_name}/hsic_adj": self.hsic_adj})
+            wandb_payload[f"{panel_name}/hsic_adj"] = self.hsic_adj
 
         """Disentanglement"""
         disent_metrics, self.munkres_permutation_idx = calc_disent_metrics(
@@ -150,18 +172,26 @@ class ContrastiveICAModule(pl.LightningModule):
         )
 
         # for sweeps
-        self.log("val_loss", losses.total_loss, on_epoch=True, on_step=False)
-        self.log("val_mcc", disent_metrics.perm_score, on_epoch=True, on_step=False)
+        # averaged over the ranks with DDP
+        self.log(
+            "val_loss", losses.total_loss, on_epoch=True, on_step=False, sync_dist=True
+        )
+        self.log(
+            "val_mcc",
+            disent_metrics.perm_score,
+            on_epoch=True,
+            on_step=False,
+            sync_dist=True,
+        )
 
-        if isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True:
-            self.logger.experiment.log(
-                {
-                    f"{panel_name}/disent/non_perm_corr_mat": disent_metrics.non_perm_corr_mat
-                }
-            )
-            self.logger.experiment.log(
-                {f"{panel_name}/disent/perm_corr_mat": disent_metrics.perm_corr_mat}
-            )
+        wandb_payload[
+            f"{panel_name}/disent/non_perm_corr_mat"
+        ] = disent_metrics.non_perm_corr_mat
+        wandb_payload[
+            f"{panel_name}/disent/perm_corr_mat"
+        ] = disent_metrics.perm_corr_mat
+
+        self._log_to_wandb(wandb_payload)
 
         self.log_scatter_latent_rec(sources[0], reconstructions[0], "n1")
         self.log_scatter_latent_rec(mixtures[0], reconstructions[0], "z1_n1_rec")
@@ -169,19 +199,24 @@ class ContrastiveICAModule(pl.LightningModule):
         return losses.total_loss
 
     def _calc_and_log_matrices(self, mixtures, sources):
-        dep_mat, numerical_jacobian, enc_dec_jac = jacobians(
-            self.model, sources[0], mixtures[0]
-        )
+        # the Jacobians are compared against the GT, so keep them in float32
+        # when training with mixed precision
+        with torch.autocast(device_type=self.device.type, enabled=False):
+            dep_mat, numerical_jacobian, enc_dec_jac = jacobians(
+                self.model, sources[0].float(), mixtures[0].float()
+            )
 
-        if isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True:
+        if self._wandb_logging is True:
             self.logger.experiment.summary[
                 "Unmixing/unmixing_jacobian"
             ] = dep_mat.detach()
 
             if self.hparams.verbose is True:
-                self.logger.experiment.log({"enc_dec_jacobian": enc_dec_jac.detach()})
-                self.logger.experiment.log(
-                    {"numerical_jacobian": numerical_jacobian.detach()}
+                self._log_to_wandb(
+                    {
+                        "enc_dec_jacobian": enc_dec_jac,
+                        "numerical_jacobian": numerical_jacobian,
+                    }
                 )
 
         return dep_mat
@@ -206,12 +241,15 @@ class ContrastiveICAModule(pl.LightningModule):
         )
 
         # estimate entropy (i.e., the baseline of the loss)
-        entropy_estimate, _, _ = self.model.loss(
-            *sources,
-            # z3,
-            *sources,
-            # z3
-        )
+        # it only depends on the data and is not part of the total loss,
+        # so do not build an autograd graph for it
+        with torch.inference_mode():
+            entropy_estimate, _, _ = self.model.loss(
+                *sources,
+                # z3,
+                *sources,
+                # z3
+            )
 
         losses = ContrastiveLosses(
             cl_pos=loss_pos_mean,
@@ -222,34 +260,38 @@ class ContrastiveICAModule(pl.LightningModule):
         return sources, mixtures, reconstructions, losses
 
     def log_scatter_latent_rec(self, latent, rec, name: str):
-        if (
-            self.hparams.log_latent_rec is True
-            and isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True
-        ):
-            for i in range(self.hparams.latent_dim):
-                table = wandb.Table(
-                    data=torch.stack((latent[:, i], rec[:, i])).T.tolist(),
-                    columns=["latent", "rec"],
-                )
+        if self.hparams.log_latent_rec is True and self._wandb_logging is True:
+            # a single transfer for all dimensions, shape: (batch, latent_dim, 2)
+            latent_rec = torch.stack((latent, rec), dim=-1).detach().cpu().numpy()
 
-                self.logger.experiment.log(
-                    {
-                        f"latent_rec_{name}_dim_{i}": wandb.plot.scatter(
-                            table,
-                            "latent",
-                            "rec",
-                            title=f"Latents vs reconstruction of {name} in dimension {i}",
-                        )
-                    }
-                )
+            self._log_to_wandb(
+                {
+                    f"latent_rec_{name}_dim_{i}": wandb.plot.scatter(
+                        wandb.Table(data=latent_rec[:, i], columns=["latent", "rec"]),
+                        "latent",
+                        "rec",
+                        title=f"Latents vs reconstruction of {name} in dimension {i}",
+                    )
+                    for i in range(self.hparams.latent_dim)
+                }
+            )
+
+    def _log_to_wandb(self, payload: dict) -> None:
+        """
+        Logs to W&B if a WandbLogger is used (wandb.log already queues the data to its own process).
+
+        :param payload: dictionary to pass to `wandb.log`
+        """
+        if self._wandb_logging is True:
+            self.logger.experiment.log(payload)
 
     def on_fit_start(self) -> None:
-        if isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True:
+        if self._wandb_logging is True:
             for key, val in self.trainer.datamodule.data_to_log.items():
                 self.logger.experiment.summary[key] = val
 
     def on_fit_end(self) -> None:
-        if isinstance(self.logger, pl.loggers.wandb.WandbLogger) is True:
+        if self._wandb_logging is True:
             """ICA permutation indices"""
             self.logger.experiment.summary[
                 "munkres_permutation_idx"
@@ -275,7 +317,7 @@ class ContrastiveICAModule(pl.LightningModule):
             )
             self.logger.experiment.log({f"hsic_adj_table": table})
 
-        if self.hparams.offline is True:
+        if self.hparams.offline is True and self._wandb_logging is True:
             # Syncing W&B at the end
             # 1. save sync dir (after marking a run finished, the W&B object changes (is teared down?)
             sync_dir = dirname(self.logger.experiment.dir)
@@ -48,7 +48,7 @@ def dataloader(args):
         lambda x: x
         @ torch.tril(torch.ones(args.latent_dim, args.latent_dim, device=args.device)),
     )
-    dl = DataLoader(ds, args.batch_size)
+    dl = DataLoader(ds, batch_size=None)
     return dl
 
 
@@ -1,5 +1,8 @@
+from argparse import Namespace
+
 from care_nl_ica.data.datamodules import ContrastiveDataModule
 import torch
+from pytorch_lightning import seed_everything
 
 
 def test_contrastive_datamodule(datamodule: ContrastiveDataModule):
@@ -11,3 +14,35 @@ def test_contrastive_datamodule(datamodule: ContrastiveDataModule):
     # calculates the variance accross the batch and n dimensions
     # to check that we do not get the same data
     torch.any(torch.stack(batches).var(0).sum([-1, -2]) > 1e-7)
+
+
+def test_unmixing_jacobian(datamodule: ContrastiveDataModule):
+    mixing_jacobian = datamodule.mixing_jacobian
+
+    # the SEM Jacobian is lower triangular, i.e., the triangular solve is used
+    assert torch.equal(mixing_jacobian, mixing_jacobian.tril())
+    assert torch.allclose(
+        datamodule.unmixing_jacobian,
+        torch.tril(mixing_jacobian.inverse()),
+        atol=1e-6,
+    )
+
+
+def test_per_rank_batches(args):
+    datamodules = []
+    for rank in range(2):
+        seed_everything(args.seed_everything)
+        dm = ContrastiveDataModule.from_argparse_args(
+            Namespace(**{**args.data, "device": "cpu"})
+        )
+        # stand-in for a DDP trainer
+        dm.trainer = Namespace(world_size=2, global_rank=rank)
+        dm.setup()
+        datamodules.append(dm)
+
+    # the ranks share the ground truth, but sample different batches
+    assert torch.equal(datamodules[0].mixing.weight, datamodules[1].mixing.weight)
+    assert not torch.allclose(
+        next(iter(datamodules[0].train_dataloader()))[0],
+        next(iter(datamodules[1].train_dataloader()))[0],
+    )
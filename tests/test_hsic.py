@@ -0,0 +1,34 @@
+import torch
+
+from care_nl_ica.independence.hsic import HSIC
+from care_nl_ica.utils import setup_seed
+
+
+def test_center_kernel():
+    setup_seed(1)
+    num_samples = 32
+
+    x = torch.randn(num_samples, 3, dtype=torch.float64)
+    kernel = HSIC.rbf(x, x, 1.0)
+    H = torch.eye(num_samples, dtype=torch.float64) - 1.0 / num_samples
+
+    assert torch.allclose(HSIC.center_kernel(kernel), H @ kernel @ H)
+
+
+def test_permuted_kernel_statistics():
+    setup_seed(1)
+    num_samples = 32
+    ls_x, ls_y = 1.0, 1.5
+
+    hsic = HSIC(num_permutations=10)
+    x = torch.randn(num_samples, 2, dtype=torch.float64)
+    y = x + 0.5 * torch.randn(num_samples, 2, dtype=torch.float64)
+    idx = torch.randperm(num_samples)
+
+    centered_kernel_x = hsic.center_kernel(hsic.rbf(x, x, ls_x))
+    kernel_y = hsic.rbf(y, y, ls_y)
+
+    assert torch.allclose(
+        hsic._statistics_from_kernels(centered_kernel_x, kernel_y[idx][:, idx]),
+        hsic.test_statistics(x, y[idx], ls_x, ls_y),
+    )
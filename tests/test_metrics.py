@@ -1,4 +1,5 @@
 from care_nl_ica.metrics.dep_mat import JacobianBinnedPrecisionRecall
+from care_nl_ica.metrics.ica_dis import corr_matrix
 import torch
 
 
@@ -18,3 +19,44 @@ def test_jacobian_prec_recall():
     jac_pr(preds, target)
     precisions, recalls, thresholds = jac_pr.compute()
     print(precisions, recalls, thresholds)
+
+
+def test_jacobian_prec_recall_counts():
+    num_dim = 3
+    num_thresholds = 15
+    target = torch.tril(
+        torch.bernoulli(0.5 * torch.ones(num_dim, num_dim)), -1
+    ) + torch.eye(num_dim)
+    preds = torch.tril(torch.randn_like(target))
+
+    # reference: one threshold at a time
+    normed_preds = preds.abs().reshape(-1) / preds.abs().max()
+    edges = target.reshape(-1).bool()
+    thresholds = JacobianBinnedPrecisionRecall(num_thresholds=num_thresholds).thresholds
+    tps, fps, fns = [torch.zeros(num_thresholds) for _ in range(3)]
+    for i in range(num_thresholds):
+        predictions = normed_preds >= thresholds[i]
+        tps[i] = (edges & predictions).sum()
+        fps[i] = (~edges & predictions).sum()
+        fns[i] = (edges & ~predictions).sum()
+
+    for t in (target, target.bool()):
+        jac_pr = JacobianBinnedPrecisionRecall(num_thresholds=num_thresholds)
+        jac_pr.update(preds.clone(), t)
+
+        assert torch.equal(jac_pr.TPs, tps)
+        assert torch.equal(jac_pr.FPs, fps)
+        assert torch.equal(jac_pr.FNs, fns)
+
+
+def test_corr_matrix():
+    num_dim = 3
+    x = torch.randn(num_dim, 100)
+    y = x + 0.5 * torch.randn(num_dim, 100)
+
+    # the cross-correlation block of the joint correlation matrix
+    assert torch.allclose(
+        corr_matrix(x, y),
+        torch.corrcoef(torch.cat((x, y)))[:num_dim, num_dim:],
+        atol=1e-6,
+    )